@@ -1,13 +1,16 @@
+import asyncio
 import logging
 import os
-import shutil
-from tempfile import NamedTemporaryFile
+import sys
+from dataclasses import asdict
+from tempfile import SpooledTemporaryFile
 from typing import Any
 from uuid import UUID, uuid7
 
+import aiofiles.os
+import aiofiles.tempfile
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     Depends,
     File,
     HTTPException,
@@ -20,16 +23,19 @@ from fastapi.security import APIKeyHeader
 from pydantic import BaseModel, ConfigDict
 
 from app.container import AppContainer
-from core.fin_report_file_loaders.models import ReportFileData
-from core.fin_report_processors.models import MetricValues, ProcessedData
+from app.tasks import process_report_task
+from core.fin_report_processors.models import MetricValues
 
 logger = logging.getLogger(__name__)
 
 MAX_UPLOAD_SIZE_BYTES = 2 * 1024 * 1024
-ALLOWED_CONTENT_TYPES = {
-    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-    "application/octet-stream",
-}
+UPLOAD_CHUNK_SIZE_BYTES = 64 * 1024
+ALLOWED_CONTENT_TYPES = frozenset(
+    {
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "application/octet-stream",
+    }
+)
 
 api_key_header = APIKeyHeader(name="X-API-Key")
 
@@ -82,11 +88,11 @@ def create_reports_router(container: AppContainer, api_key: str | None) -> APIRo
 
 
 async def upload_report(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     container: AppContainer = Depends(get_container),
 ) -> UploadReportResponse:
-    if not file.filename or not file.filename.lower().endswith(".xlsx"):
+    # The cheap filename check runs first so bad names skip the MIME lookup.
+    if not file.filename or os.path.splitext(file.filename)[1].lower() != ".xlsx":
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
             detail="File must have .xlsx extension",
@@ -98,18 +104,16 @@ async def upload_report(
             detail="Unsupported file content type",
         )
 
-    temp_path = await _persist_upload(file)
+    max_size_bytes = container.config.uploads.max_size_bytes() or MAX_UPLOAD_SIZE_BYTES
+    temp_path = await _persist_upload(file, max_size_bytes)
     file_reader = container.report_file_reader()
-    report_data_builder = container.report_data_builder()
-    processed_report_repository = container.processed_report_repository()
 
     try:
         # This is a tricky part. The 'structured_output' is needed for the user,
         # but it's not the best input for the LLM.
         # I believe it's better to avoid creating the 'structured_output' in the first place
         # and just return the report ID instead.
-        structured_output = await file_reader.structured_output(temp_path)
-        report_file_data = await file_reader.read(temp_path)
+        structured_output, report_file_data = await file_reader.read_all(temp_path)
         # This common exception is used to investigate the types of errors that can occur.
     except Exception as exc:  # noqa: BLE001
         logger.exception("Failed to read uploaded report: %s", exc)
@@ -117,41 +121,17 @@ async def upload_report(
             status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
             detail="Unable to parse the uploaded Excel file",
         ) from exc
+    finally:
+        # The worker gets the parsed content, so the file is not needed past here.
+        await _remove_temp_file(temp_path)
 
     report_id = uuid7()
-
-    async def process_in_background(data: ReportFileData, generated_id: UUID) -> None:
-        """
-        Task to process the report in the background and clean up the temp file.
-        """
-        # Ensure the temporary file is cleaned up after processing
-        temp_file_path = data.metadata.get("source")
-
-        processed = await report_data_builder.process(data)
-
-        if isinstance(processed, Exception):
-            logger.error(
-                "Report %s failed during processing: %s",
-                generated_id,
-                processed,
-            )
-            processed_with_id = ProcessedData(
-                report_id=generated_id,
-                data={},
-                error=str(processed),
-            )
-        else:
-            processed_with_id = processed.model_copy(update={"report_id": generated_id})
-
-        await processed_report_repository.save(processed_with_id)
-
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-            except OSError as e:
-                logger.error("Failed to remove temp file %s: %s", temp_file_path, e)
-
-    background_tasks.add_task(process_in_background, report_file_data, report_id)
+    # Enqueueing talks to Redis synchronously; keep it off the event loop.
+    await asyncio.to_thread(
+        process_report_task.send,
+        str(report_id),
+        asdict(report_file_data),
+    )
 
     return UploadReportResponse(
         report_id=report_id,
@@ -181,39 +161,106 @@ async def get_processed_report(
             detail="Report processing failed. Please try again later.",
         )
 
-    payload = ProcessedReportResponse.model_validate(
-        processed.model_dump(mode="json", exclude={"error"})
+    return ProcessedReportResponse(
+        report_id=processed.report_id,
+        processed_at=processed.processed_at.isoformat(),
+        data=processed.data,
     )
-    return payload
 
 
-async def _persist_upload(upload: UploadFile) -> str:
-    if upload.size is not None:
-        size = upload.size
-    else:
-        contents = await upload.read()
-        size = len(contents)
-        await upload.seek(0)
-
-    if size > MAX_UPLOAD_SIZE_BYTES:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
-            detail="File exceeded 2MB limit",
-        )
+async def _persist_upload(
+    upload: UploadFile, max_size_bytes: int = MAX_UPLOAD_SIZE_BYTES
+) -> str:
+    if upload.size is not None and upload.size > max_size_bytes:
+        raise _upload_too_large_error(max_size_bytes)
+
+    source_fd = _sendfile_source_fd(upload)
+    async with aiofiles.tempfile.NamedTemporaryFile(
+        "wb", delete=False, suffix=".xlsx"
+    ) as temp_file:
+        try:
+            if source_fd is not None:
+                size = await asyncio.to_thread(
+                    _sendfile_upload, source_fd, temp_file.fileno(), max_size_bytes
+                )
+            else:
+                size = await _stream_upload(upload, temp_file, max_size_bytes)
+        except Exception:  # noqa: BLE001
+            await temp_file.close()
+            await aiofiles.os.remove(temp_file.name)
+            raise
 
     if size == 0:
+        await aiofiles.os.remove(temp_file.name)
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
             detail="Uploaded file is empty",
         )
 
-    temp_file = NamedTemporaryFile(delete=False, suffix=".xlsx")
+    return temp_file.name
+
+
+async def _remove_temp_file(temp_path: str) -> None:
     try:
-        shutil.copyfileobj(upload.file, temp_file)
-    except Exception:  # noqa: BLE001
-        temp_file.close()
-        os.remove(temp_file.name)
-        raise
+        await aiofiles.os.remove(temp_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.error("Failed to remove temp file %s: %s", temp_path, e)
+
+
+async def _stream_upload(
+    upload: UploadFile, temp_file: Any, max_size_bytes: int
+) -> int:
+    size = 0
+    while chunk := await upload.read(UPLOAD_CHUNK_SIZE_BYTES):
+        size += len(chunk)
+        if size > max_size_bytes:
+            raise _upload_too_large_error(max_size_bytes)
+        await temp_file.write(chunk)
+    return size
+
+
+def _sendfile_source_fd(upload: UploadFile) -> int | None:
+    """
+    Return the upload's file descriptor when it can be copied with os.sendfile.
+
+    Only Linux supports sendfile between regular files, and only uploads that
+    Starlette already spooled to disk have a descriptor worth copying from.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+
+    source = upload.file
+    # fileno() on an in-memory spooled file would force it onto disk.
+    if isinstance(source, SpooledTemporaryFile) and not source._rolled:
+        return None
 
-    temp_file.close()
-    return temp_file.name
+    try:
+        return source.fileno()
+    except (AttributeError, OSError):
+        return None
+
+
+def _sendfile_upload(source_fd: int, target_fd: int, max_size_bytes: int) -> int:
+    size = os.fstat(source_fd).st_size
+    if size > max_size_bytes:
+        raise _upload_too_large_error(max_size_bytes)
+
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(target_fd, source_fd, offset, size - offset)
+        if sent == 0:
+            break
+        offset += sent
+    return offset
+
+
+def _upload_too_large_error(max_size_bytes: int) -> HTTPException:
+    if max_size_bytes == MAX_UPLOAD_SIZE_BYTES:
+        detail = "File exceeded 2MB limit"
+    else:
+        detail = f"File exceeded {max_size_bytes} byte limit"
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=detail
+    )
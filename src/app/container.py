@@ -1,11 +1,12 @@
 from dependency_injector import containers, providers
 from langchain.chat_models import init_chat_model
 from langchain_core.language_models.base import BaseLanguageModel
-from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
 
 from core.fin_report_processors.services import ReportDataBuilder
-from infra.database import init_database
+from infra.database import create_database_engine, init_database
 from infra.llm_based_processor import ReportDataProcessor as LLMReportDataProcessor
+from infra.llm_based_processor import build_structured_llm
 from infra.sqlalchemy_repository import SqlAlchemyProcessedReportRepository
 from infra.xlsx_reader import XlsxFileReader
 
@@ -22,18 +23,26 @@ class AppContainer(containers.DeclarativeContainer):
         api_key=config.api_keys.openai,
     )
 
+    structured_llm = providers.Singleton(build_structured_llm, llm)
+
     report_file_reader = providers.Singleton(XlsxFileReader)
 
-    report_data_processor_factory = providers.Factory(
+    report_metrics_config = providers.Singleton(
+        ReportDataBuilder.resolve_metrics_config,
+        config.processor.metrics,
+    )
+
+    shared_report_data_processor = providers.Singleton(
         LLMReportDataProcessor,
-        llm=llm,
-        prompt_template=config.llm.prompt_template.optional(None),
+        structured_llm=structured_llm,
+        metrics_config=report_metrics_config,
+        prompt_template=config.llm.prompt_template,
     )
 
     report_data_builder = providers.Factory(
         ReportDataBuilder,
-        metrics_config=config.processor.metrics.optional(None),
-        processor_factory=report_data_processor_factory.provider,
+        metrics_config=report_metrics_config,
+        processor_factory=shared_report_data_processor.provider,
     )
 
     report_data_processor = providers.DelegatedFactory(
@@ -41,9 +50,9 @@ class AppContainer(containers.DeclarativeContainer):
     )
 
     db_engine: providers.Provider[AsyncEngine] = providers.Singleton(
-        create_async_engine,
+        create_database_engine,
         config.database.url,
-        echo=config.database.echo.optional(False),
+        echo=config.database.echo.as_(bool),
     )
 
     session_factory = providers.Singleton(
@@ -61,3 +70,19 @@ class AppContainer(containers.DeclarativeContainer):
         init_database,
         engine=db_engine,
     )
+
+
+def create_container() -> AppContainer:
+    """Create a container configured from the process environment."""
+    container = AppContainer()
+
+    container.config.api_keys.openai.from_env("OPENAI_API_KEY")
+    container.config.database.url.from_env(
+        "DATABASE_URL",
+        default="sqlite+aiosqlite:///./fin_reports.db",
+    )
+    container.config.api_keys.service.from_env(
+        "FIN_REPORT_EXTRACTOR_API_KEY",
+        default=None,
+    )
+    return container
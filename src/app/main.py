@@ -1,35 +1,32 @@
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
 from app.api.reports import create_reports_router
-from app.container import AppContainer
+from app.container import AppContainer, create_container
 
 
 def create_app(container: AppContainer | None = None) -> FastAPI:
     if container is None:
-        container = AppContainer()
-
-        container.config.api_keys.openai.from_env("OPENAI_API_KEY")
-        container.config.database.url.from_env(
-            "DATABASE_URL",
-            default="sqlite+aiosqlite:///./fin_reports.db",
-        )
-        container.config.api_keys.service.from_env(
-            "FIN_REPORT_EXTRACTOR_API_KEY",
-            default=None,
-        )
+        container = create_container()
 
     @asynccontextmanager
     async def lifespan(_: FastAPI):
         await container.init_resources()
         try:
+            # Build the shared processor now so an invalid configuration (such
+            # as a bad prompt template) stops startup instead of every upload.
+            container.shared_report_data_processor()
             yield
         finally:
-            container.shutdown_resources()
+            await container.shutdown_resources()
 
-    app = FastAPI(title="Financial Report Extractor", lifespan=lifespan)
+    app = FastAPI(
+        title="Financial Report Extractor",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+    )
     app.state.container = container
 
     api_key = container.config.api_keys.service()
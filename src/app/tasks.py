@@ -0,0 +1,78 @@
+import asyncio
+import logging
+import os
+from typing import Any
+from uuid import UUID
+
+import dramatiq
+from dramatiq.brokers.redis import RedisBroker
+from dramatiq.middleware import AsyncIO
+
+from app.container import AppContainer, create_container
+from core.fin_report_file_loaders.models import ReportFileData
+from core.fin_report_processors.models import ProcessedData
+
+logger = logging.getLogger(__name__)
+
+REPORTS_QUEUE = "reports"
+
+broker = RedisBroker(url=os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+broker.add_middleware(AsyncIO())
+dramatiq.set_broker(broker)
+
+_worker_container: AppContainer | None = None
+_worker_container_lock = asyncio.Lock()
+
+
+@dramatiq.actor(queue_name=REPORTS_QUEUE, max_retries=3)
+async def process_report_task(report_id: str, report_file_data: dict[str, Any]) -> None:
+    """Worker entry point: run the LLM extraction for one uploaded report."""
+    container = await _get_worker_container()
+    await process_report(container, ReportFileData(**report_file_data), UUID(report_id))
+
+
+async def process_report(
+    container: AppContainer, data: ReportFileData, generated_id: UUID
+) -> None:
+    """
+    Process the parsed report and store the result under the id given to the user.
+
+    Processing dependencies are resolved here rather than in the request handler,
+    so the task only needs the container and plain report data to run.
+    """
+    report_data_builder = container.report_data_builder()
+    processed_report_repository = container.processed_report_repository()
+
+    try:
+        processed = await report_data_builder.process(data)
+    except ValueError as exc:
+        # Processor configuration errors surface here; store them so the
+        # report reads as failed instead of staying missing.
+        processed = exc
+
+    if isinstance(processed, Exception):
+        logger.error(
+            "Report %s failed during processing: %s",
+            generated_id,
+            processed,
+        )
+        processed_with_id = ProcessedData(
+            report_id=generated_id,
+            data={},
+            error=str(processed),
+        )
+    else:
+        processed_with_id = processed.model_copy(update={"report_id": generated_id})
+
+    await processed_report_repository.save(processed_with_id)
+
+
+async def _get_worker_container() -> AppContainer:
+    """Build and initialize the worker process's container on first use."""
+    global _worker_container
+    async with _worker_container_lock:
+        if _worker_container is None:
+            container = create_container()
+            await container.init_resources()
+            _worker_container = container
+    return _worker_container
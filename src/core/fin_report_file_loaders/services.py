@@ -12,3 +12,9 @@ class ReportFileReader(abc.ABC):
     @abc.abstractmethod
     async def structured_output(self, file_path: str) -> dict[str, Any]:
         "Provide structured output for the report file"
+
+    @abc.abstractmethod
+    async def read_all(
+        self, file_path: str
+    ) -> tuple[list[dict[str, Any]], ReportFileData]:
+        """Parse the report file once, returning its structured output and contents."""
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, LargeBinary, String, Text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -14,7 +14,8 @@ class ReportRecord(Base):
 
     __tablename__ = "processed_reports"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    # UUID stored in its 16-byte binary form.
+    id: Mapped[bytes] = mapped_column(LargeBinary(16), primary_key=True)
     processed_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False
     )
@@ -29,10 +30,11 @@ class ReportMetricRecord(Base):
     """ORM model storing metric values associated with a processed report."""
 
     __tablename__ = "processed_report_metrics"
+    __table_args__ = (Index("ix_metrics_report_id", "report_id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    report_id: Mapped[str] = mapped_column(
-        String(36),
+    report_id: Mapped[bytes] = mapped_column(
+        LargeBinary(16),
         ForeignKey("processed_reports.id", ondelete="CASCADE"),
         nullable=False,
     )
@@ -11,7 +11,7 @@ class MetricValues(BaseModel):
     current: Optional[str] = Field(default=None)
     previous: Optional[str] = Field(default=None)
 
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
 
 
 class ProcessedData(BaseModel):
@@ -1,4 +1,5 @@
 import abc
+from types import MappingProxyType
 from typing import Callable, Dict, Mapping, Optional
 
 from core.fin_report_file_loaders.models import ReportFileData
@@ -7,7 +8,8 @@ from core.fin_report_processors.models import (
     ProcessedData,
 )
 
-ProcessorFactory = Callable[[Mapping[str, Dict[str, object]]], "ReportDataProcessor"]
+MetricsConfig = Mapping[str, Mapping[str, object]]
+ProcessorFactory = Callable[[], "ReportDataProcessor"]
 
 
 class ReportDataProcessor(abc.ABC):
@@ -15,14 +17,13 @@ class ReportDataProcessor(abc.ABC):
 
     def __init__(
         self,
-        metrics_config: Mapping[str, Dict[str, object]],
+        metrics_config: MetricsConfig,
     ) -> None:
-        self._metrics_config: Dict[str, Dict[str, object]] = {
-            metric_name: dict(config) for metric_name, config in metrics_config.items()
-        }
+        # Builders hand over a read-only mapping, so it is shared, not copied.
+        self._metrics_config = metrics_config
 
     @property
-    def metrics_config(self) -> Mapping[str, Dict[str, object]]:
+    def metrics_config(self) -> MetricsConfig:
         return self._metrics_config
 
     @abc.abstractmethod
@@ -44,17 +45,43 @@ class ReportDataBuilder:
         ] = None,
         processor_factory: ProcessorFactory | None = None,
     ) -> None:
+        self.metrics_config = self.resolve_metrics_config(metrics_config)
+        self._processor_factory = processor_factory
+        self._processor: ReportDataProcessor | None = None
+
+    @classmethod
+    def resolve_metrics_config(
+        cls,
+        metrics_config: Optional[
+            Mapping[str, Dict[str, object]] | DefaultMetricsModel
+        ] = None,
+    ) -> MetricsConfig:
+        """Normalize a metrics configuration into a read-only mapping."""
+        if isinstance(metrics_config, MappingProxyType):
+            return metrics_config
         if metrics_config is None:
-            self.metrics_config = self.DEFAULT_METRICS_MODEL.model_dump(mode="python")
+            metrics_config = cls.DEFAULT_METRICS_MODEL.model_dump(mode="python")
         elif isinstance(metrics_config, DefaultMetricsModel):
-            self.metrics_config = metrics_config.model_dump(mode="python")
-        else:
-            self.metrics_config = dict(metrics_config)
+            metrics_config = metrics_config.model_dump(mode="python")
 
-        self._processor_factory = processor_factory
+        return MappingProxyType(
+            {
+                metric_name: MappingProxyType(dict(config))
+                for metric_name, config in metrics_config.items()
+            }
+        )
 
     def build_processor(self) -> ReportDataProcessor:
-        return self._processor_factory(metrics_config=self.metrics_config)
+        if self._processor is None:
+            processor = self._processor_factory()
+            # The factory may hand back a shared instance configured elsewhere,
+            # so make sure it extracts the metrics this builder was given.
+            if processor.metrics_config != self.metrics_config:
+                raise ValueError(
+                    "Processor metrics config does not match the builder's config"
+                )
+            self._processor = processor
+        return self._processor
 
     async def process(
         self, report_file_data: ReportFileData
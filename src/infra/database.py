@@ -1,9 +1,81 @@
-from sqlalchemy.ext.asyncio import AsyncEngine
+from typing import Any, AsyncIterator
 
-from core.fin_report_processors.db_models import Base
+from sqlalchemy import Connection, LargeBinary, event, inspect
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import StaticPool
 
+from core.fin_report_processors.db_models import Base, ReportRecord
 
-async def init_database(engine: AsyncEngine) -> None:
-    """Ensure all database tables exist before the application starts."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def create_database_engine(url: str, echo: bool = False) -> AsyncEngine:
+    """Create the async engine with pooling and SQLite tuning applied."""
+    database_url = make_url(url)
+    is_sqlite = database_url.get_backend_name() == "sqlite"
+
+    engine_kwargs: dict[str, Any] = {"echo": echo, "pool_pre_ping": True}
+    if is_sqlite:
+        engine_kwargs["connect_args"] = {"timeout": 30}
+    if is_sqlite and _is_in_memory_sqlite(database_url):
+        # Every connection to :memory: opens a fresh database, so all sessions
+        # must share one static connection to see the same tables.
+        engine_kwargs["poolclass"] = StaticPool
+    else:
+        engine_kwargs.update(pool_size=10, max_overflow=20)
+
+    engine = create_async_engine(database_url, **engine_kwargs)
+    if is_sqlite:
+        event.listen(engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    return engine
+
+
+async def init_database(engine: AsyncEngine) -> AsyncIterator[None]:
+    """Ensure all database tables exist and release pooled connections on shutdown."""
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(_check_report_id_column)
+            await conn.run_sync(Base.metadata.create_all)
+    except Exception:
+        await engine.dispose()
+        raise
+
+    yield
+
+    await engine.dispose()
+
+
+def _check_report_id_column(conn: Connection) -> None:
+    """Refuse to start on a schema that still stores report ids as strings."""
+    table_name = ReportRecord.__tablename__
+    inspector = inspect(conn)
+    if not inspector.has_table(table_name):
+        return
+
+    columns = {column["name"]: column for column in inspector.get_columns(table_name)}
+    id_column = columns.get("id")
+    if id_column is not None and not isinstance(id_column["type"], LargeBinary):
+        raise RuntimeError(
+            f"Table {table_name!r} stores report ids as {id_column['type']}, but "
+            "they are now 16-byte binary UUIDs. Existing reports cannot be "
+            "migrated; drop the processed_reports and processed_report_metrics "
+            "tables (or delete the SQLite database file) and restart."
+        )
+
+
+def _is_in_memory_sqlite(url: URL) -> bool:
+    return url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+
+
+def _apply_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
@@ -1,14 +1,16 @@
 import json
 import logging
 from datetime import datetime, timezone
-from typing import Dict, List, Mapping, Optional
+from typing import Any, Callable, Dict, List, Mapping, Optional
 from uuid import uuid7
 
 from langchain_core.language_models.base import BaseLanguageModel
+from langchain_core.runnables import Runnable
 from pydantic import BaseModel, Field
 
 from core.fin_report_file_loaders.models import ReportFileData
 from core.fin_report_processors.models import MetricValues, ProcessedData
+from core.fin_report_processors.services import MetricsConfig
 from core.fin_report_processors.services import (
     ReportDataProcessor as BaseReportDataProcessor,
 )
@@ -40,6 +42,15 @@ class ExtractionResult(BaseModel):
     )
 
 
+# Compact JSON keeps the prompt short: indentation only adds tokens for the LLM.
+JSON_SEPARATORS = (",", ":")
+
+# Upper bounds on what a single report may contribute to the prompt, so an
+# unusually large or malformed workbook cannot inflate LLM latency and cost.
+MAX_METADATA_CHARS = 8_000
+MAX_CONTENT_CHARS = 200_000
+ESSENTIAL_METADATA_KEYS = ("source", "sheet_names", "n_rows", "n_cols")
+
 DEFAULT_PROMPT_TEMPLATE = """You are an assistant that extracts structured financial metrics.
 
 Report metadata (JSON):
@@ -55,31 +66,57 @@ Metrics to extract (JSON):
 """
 
 
+def build_structured_llm(llm: BaseLanguageModel) -> Runnable:
+    """Bind the LLM to the ExtractionResult schema expected by the processor."""
+    return llm.with_structured_output(ExtractionResult)
+
+
+def _dump_json(value: Any) -> str:
+    return json.dumps(
+        value, default=str, ensure_ascii=False, separators=JSON_SEPARATORS
+    )
+
+
 class ReportDataProcessor(BaseReportDataProcessor):
     """LangChain-backed processor that delegates extraction to an LLM."""
 
+    # Shared placeholder for metrics the LLM did not return; MetricValues is frozen.
+    _EMPTY_METRIC_VALUES = MetricValues()
+
     def __init__(
         self,
-        llm: BaseLanguageModel,
-        metrics_config: Mapping[str, Dict[str, object]],
+        structured_llm: Runnable,
+        metrics_config: MetricsConfig,
         prompt_template: str | None = None,
     ) -> None:
         super().__init__(metrics_config=metrics_config)
-        self._llm = llm
+        self._structured_llm = structured_llm
         self._prompt_template = prompt_template or DEFAULT_PROMPT_TEMPLATE
-        self._structured_llm = llm.with_structured_output(ExtractionResult)
+        self._format_prompt = self._compile_prompt_template(self._prompt_template)
+        self._metrics_config_json = json.dumps(
+            self.metrics_config,
+            default=dict,
+            ensure_ascii=False,
+            separators=JSON_SEPARATORS,
+        )
 
     async def process(
         self, report_file_data: ReportFileData
     ) -> ProcessedData | Exception:
         metadata = report_file_data.metadata or {}
         content = report_file_data.content or ""
-        prompt = self._prompt_template.format(
-            metadata_json=json.dumps(
-                metadata, default=str, ensure_ascii=False, indent=2
-            ),
+        if len(content) > MAX_CONTENT_CHARS:
+            logger.warning(
+                "Report content truncated from %d to %d characters",
+                len(content),
+                MAX_CONTENT_CHARS,
+            )
+            content = content[:MAX_CONTENT_CHARS]
+
+        prompt = self._format_prompt(
+            metadata_json=self._dump_metadata(metadata),
             content=content,
-            metrics_json=json.dumps(self.metrics_config, ensure_ascii=False, indent=2),
+            metrics_json=self._metrics_config_json,
         )
 
         try:
@@ -97,20 +134,42 @@ class ReportDataProcessor(BaseReportDataProcessor):
             processed_at=datetime.now(timezone.utc),
         )
 
+    @staticmethod
+    def _dump_metadata(metadata: Mapping[str, Any]) -> str:
+        metadata_json = _dump_json(metadata)
+        if len(metadata_json) <= MAX_METADATA_CHARS:
+            return metadata_json
+
+        logger.warning(
+            "Report metadata of %d characters exceeds %d; keeping only %s",
+            len(metadata_json),
+            MAX_METADATA_CHARS,
+            ", ".join(ESSENTIAL_METADATA_KEYS),
+        )
+        return _dump_json(
+            {key: metadata[key] for key in ESSENTIAL_METADATA_KEYS if key in metadata}
+        )
+
+    @staticmethod
+    def _compile_prompt_template(prompt_template: str) -> Callable[..., str]:
+        """Validate the template when the processor is built, not on first use."""
+        try:
+            prompt_template.format(metadata_json="", content="", metrics_json="")
+        except (IndexError, KeyError, ValueError) as exc:
+            raise ValueError(f"Invalid prompt template: {exc!r}") from exc
+        return prompt_template.format
+
     def _build_metrics_from_extraction(
         self,
         extraction: ExtractionResult,
     ) -> Dict[str, MetricValues]:
-        processed: Dict[str, MetricValues] = {
-            metric_name: MetricValues() for metric_name in self.metrics_config.keys()
+        found: Dict[str, MetricValues] = {
+            metric.name: MetricValues(current=metric.current, previous=metric.previous)
+            for metric in extraction.metrics
+            if metric.name in self.metrics_config
         }
 
-        for metric in extraction.metrics:
-            name = metric.name
-            if name not in processed:
-                continue
-            processed[name] = MetricValues(
-                current=metric.current, previous=metric.previous
-            )
-
-        return processed
+        return {
+            metric_name: found.get(metric_name, self._EMPTY_METRIC_VALUES)
+            for metric_name in self.metrics_config
+        }
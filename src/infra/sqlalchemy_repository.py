@@ -1,7 +1,8 @@
 from typing import Dict
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import selectinload
 
@@ -12,6 +13,12 @@ from core.fin_report_processors.db_models import (
 from core.fin_report_processors.models import MetricValues, ProcessedData
 from core.fin_report_processors.repository import ProcessedReportRepository
 
+# Dialect-specific INSERT constructs that support ON CONFLICT DO UPDATE.
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
 
 class SqlAlchemyProcessedReportRepository(ProcessedReportRepository):
     """Async SQLAlchemy implementation of ProcessedReportRepository."""
@@ -20,41 +27,36 @@ class SqlAlchemyProcessedReportRepository(ProcessedReportRepository):
         self._session_factory = session_factory
 
     async def save(self, processed_report: ProcessedData) -> None:
+        report_id = processed_report.report_id.bytes
         async with self._session_factory() as session:
             async with session.begin():
-                record = await session.get(
-                    ReportRecord,
-                    str(processed_report.report_id),
-                    options=(selectinload(ReportRecord.metrics),),
-                )
-                if record is None:
-                    record = ReportRecord(
-                        id=str(processed_report.report_id),
-                        processed_at=processed_report.processed_at,
+                await _upsert_report(session, report_id, processed_report)
+                await session.execute(
+                    delete(ReportMetricRecord).where(
+                        ReportMetricRecord.report_id == report_id
                     )
-                    session.add(record)
-                else:
-                    record.processed_at = processed_report.processed_at
-
-                record.error = processed_report.error
-                record.metrics.clear()
+                )
 
-                if processed_report.error is None:
-                    for name, values in processed_report.data.items():
-                        record.metrics.append(
-                            ReportMetricRecord(
-                                name=name,
-                                current_value=values.current,
-                                previous_value=values.previous,
-                            )
-                        )
+                if processed_report.error is None and processed_report.data:
+                    await session.execute(
+                        insert(ReportMetricRecord),
+                        [
+                            {
+                                "report_id": report_id,
+                                "name": name,
+                                "current_value": values.current,
+                                "previous_value": values.previous,
+                            }
+                            for name, values in processed_report.data.items()
+                        ],
+                    )
 
     async def get(self, report_id: UUID) -> ProcessedData | None:
         async with self._session_factory() as session:
             result = await session.execute(
                 select(ReportRecord)
                 .options(selectinload(ReportRecord.metrics))
-                .where(ReportRecord.id == str(report_id))
+                .where(ReportRecord.id == report_id.bytes)
             )
             record = result.scalar_one_or_none()
             if record is None:
@@ -69,8 +71,38 @@ class SqlAlchemyProcessedReportRepository(ProcessedReportRepository):
             }
 
             return ProcessedData(
-                report_id=UUID(record.id),
+                report_id=UUID(bytes=record.id),
                 data=metrics,
                 processed_at=record.processed_at,
                 error=record.error,
             )
+
+
+async def _upsert_report(
+    session: AsyncSession, report_id: bytes, processed_report: ProcessedData
+) -> None:
+    values = {
+        "processed_at": processed_report.processed_at,
+        "error": processed_report.error,
+    }
+    dialect_insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+    if dialect_insert is not None:
+        upsert = dialect_insert(ReportRecord).values(id=report_id, **values)
+        await session.execute(
+            upsert.on_conflict_do_update(
+                index_elements=[ReportRecord.id],
+                set_={name: upsert.excluded[name] for name in values},
+            )
+        )
+        return
+
+    # Dialects without ON CONFLICT support probe for the row first.
+    exists = await session.scalar(
+        select(ReportRecord.id).where(ReportRecord.id == report_id)
+    )
+    if exists is None:
+        await session.execute(insert(ReportRecord).values(id=report_id, **values))
+    else:
+        await session.execute(
+            update(ReportRecord).where(ReportRecord.id == report_id).values(**values)
+        )
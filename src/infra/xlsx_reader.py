@@ -1,8 +1,7 @@
 import asyncio
 from typing import Any
 
-import pandas as pd
-from langchain_community.document_loaders import UnstructuredExcelLoader
+import openpyxl
 
 from core.fin_report_file_loaders.models import ReportFileData
 from core.fin_report_file_loaders.services import ReportFileReader
@@ -10,18 +9,114 @@ from core.fin_report_file_loaders.services import ReportFileReader
 
 class XlsxFileReader(ReportFileReader):
     async def read(self, file_path: str) -> ReportFileData | Exception:
-        loader = UnstructuredExcelLoader(file_path, mode="single")
-        docs = await loader.aload()
-        if not docs:
+        _, content, metadata = await asyncio.to_thread(
+            self._read_workbook, file_path, with_records=False
+        )
+        return self._build_report_file_data(file_path, content, metadata)
+
+    async def structured_output(self, file_path: str) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self._read_records, file_path)
+
+    async def read_all(
+        self, file_path: str
+    ) -> tuple[list[dict[str, Any]], ReportFileData]:
+        records, content, metadata = await asyncio.to_thread(
+            self._read_workbook, file_path
+        )
+        return records, self._build_report_file_data(file_path, content, metadata)
+
+    @staticmethod
+    def _build_report_file_data(
+        file_path: str, content: str, metadata: dict[str, Any]
+    ) -> ReportFileData:
+        if not content:
             raise ValueError("No content found in the Excel file.")
 
-        content = "\n\n".join([doc.page_content for doc in docs])
-        metadata = {}
-        for doc in docs:
-            metadata.update(doc.metadata)
+        return ReportFileData(
+            content=content, metadata={"source": file_path, **metadata}
+        )
 
-        return ReportFileData(content=content, metadata=metadata)
+    @staticmethod
+    def _read_workbook(
+        file_path: str, with_records: bool = True
+    ) -> tuple[list[dict[str, Any]], str, dict[str, Any]]:
+        """
+        Parse the workbook once, collecting first-sheet records, text rows and
+        a small summary of the workbook's shape.
+        """
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            records = []
+            sheets = []
+            n_rows = 0
+            n_cols = 0
+            for index, worksheet in enumerate(workbook.worksheets):
+                collect_records = with_records and index == 0
+                headers = None
+                lines = []
+                for row in worksheet.iter_rows(values_only=True):
+                    if collect_records:
+                        if headers is None:
+                            headers = _header_names(row)
+                        else:
+                            records.append(dict(zip(headers, row)))
 
-    async def structured_output(self, file_path: str) -> list[dict[str, Any]]:
-        excel_data_df = await asyncio.to_thread(pd.read_excel, file_path)
-        return excel_data_df.to_dict(orient="records")
+                    line = "\t".join(str(cell) for cell in row if cell is not None)
+                    if line:
+                        lines.append(line)
+                        n_cols = max(n_cols, len(row))
+                if lines:
+                    sheets.append("\n".join(lines))
+                n_rows += len(lines)
+            metadata = {
+                "sheet_names": workbook.sheetnames,
+                "n_rows": n_rows,
+                "n_cols": n_cols,
+            }
+        finally:
+            workbook.close()
+
+        return records, "\n\n".join(sheets), metadata
+
+    @staticmethod
+    def _read_records(file_path: str) -> list[dict[str, Any]]:
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            worksheet = workbook.worksheets[0]
+            header_row = next(worksheet.iter_rows(values_only=True), None)
+            if header_row is None:
+                return []
+
+            headers = _header_names(header_row)
+            return [
+                dict(zip(headers, row))
+                for row in worksheet.iter_rows(min_row=2, values_only=True)
+            ]
+        finally:
+            workbook.close()
+
+
+def _header_names(row: tuple[Any, ...]) -> list[str]:
+    """
+    Turn header cells into unique string keys the way pandas does: blank cells
+    become "Unnamed: N" and repeated names get the next free ".1", ".2", ...
+    suffix.
+    """
+    headers = [
+        f"Unnamed: {index}" if cell is None else str(cell)
+        for index, cell in enumerate(row)
+    ]
+    taken = set(headers)
+    names = []
+    counts: dict[str, int] = {}
+    for header in headers:
+        name = header
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[header] = count + 1
+            name = f"{header}.{count}"
+            # Skip suffixes already used by another header cell.
+            count = count + 1 if name in taken else counts.get(name, 0)
+        names.append(name)
+        counts[name] = count + 1
+    return names
@@ -1,18 +1,36 @@
 import io
-from uuid import UUID, uuid7
+import os
+from itertools import count
+from tempfile import SpooledTemporaryFile
+from types import SimpleNamespace
+from uuid import UUID
 
 import pytest
-from fastapi.testclient import TestClient
+import pytest_asyncio
+from dramatiq import Message
+from dramatiq.brokers.stub import StubBroker
+from fastapi import HTTPException, UploadFile
 
+from app.api.reports import MAX_UPLOAD_SIZE_BYTES, _persist_upload
+from app.container import AppContainer
 from app.main import create_app
+from app.tasks import REPORTS_QUEUE, process_report, process_report_task
 from core.fin_report_file_loaders.models import ReportFileData
 from core.fin_report_processors.models import MetricValues, ProcessedData
 
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
 
 class StubFileReader:
     def __init__(self) -> None:
         self.read_calls: list[str] = []
         self.structured_calls: list[str] = []
+        self.read_all_calls: list[str] = []
+
+    def reset(self) -> None:
+        self.read_calls.clear()
+        self.structured_calls.clear()
+        self.read_all_calls.clear()
 
     async def read(self, file_path: str) -> ReportFileData:
         self.read_calls.append(file_path)
@@ -22,15 +40,29 @@ class StubFileReader:
         self.structured_calls.append(file_path)
         return [{"account": "Revenue", "amount": "1000"}]
 
+    async def read_all(
+        self, file_path: str
+    ) -> tuple[list[dict[str, str]], ReportFileData]:
+        self.read_all_calls.append(file_path)
+        return (
+            [{"account": "Revenue", "amount": "1000"}],
+            ReportFileData(content="content", metadata={"source": "test"}),
+        )
+
 
 class StubReportDataBuilder:
     def __init__(self) -> None:
         self.calls: list[ReportFileData] = []
+        self._report_ids = count(1)
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self._report_ids = count(1)
 
     async def process(self, report_file_data: ReportFileData) -> ProcessedData:
         self.calls.append(report_file_data)
         return ProcessedData(
-            report_id=uuid7(),
+            report_id=UUID(int=next(self._report_ids)),
             data={"metric": MetricValues(current="10", previous="5")},
         )
 
@@ -39,6 +71,9 @@ class InMemoryReportRepository:
     def __init__(self) -> None:
         self.storage: dict[UUID, ProcessedData] = {}
 
+    def reset(self) -> None:
+        self.storage.clear()
+
     async def save(self, processed: ProcessedData) -> None:
         self.storage[processed.report_id] = processed
 
@@ -46,77 +81,163 @@ class InMemoryReportRepository:
         return self.storage.get(report_id)
 
 
-@pytest.fixture
-def api_client(app_container):
-    api_key = "test-key"
-    file_reader = StubFileReader()
-    builder = StubReportDataBuilder()
-    repository = InMemoryReportRepository()
-
-    with app_container.report_file_reader.override(
-        file_reader
-    ), app_container.report_data_builder.override(
-        builder
-    ), app_container.processed_report_repository.override(repository):
-        app_container.config.api_keys.service.from_value(api_key)
-        app = create_app(container=app_container)
-
-        with TestClient(app) as client:
-            yield client, repository, builder, file_reader, api_key
+FILE_READER = StubFileReader()
+BUILDER = StubReportDataBuilder()
+REPOSITORY = InMemoryReportRepository()
 
 
-def test_upload_report_triggers_processing(api_client):
-    client, repository, builder, file_reader, api_key = api_client
-    file_content = b"binary-xlsx-data"
-    response = client.post(
+def _post_report(
+    client,
+    api_key,
+    body=b"binary-xlsx-data",
+    name="report.xlsx",
+    content_type=XLSX_MIME,
+):
+    return client.post(
         "/reports",
-        files={
-            "file": (
-                "report.xlsx",
-                io.BytesIO(file_content),
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            )
-        },
+        files={"file": (name, io.BytesIO(body), content_type)},
         headers={"X-API-Key": api_key},
     )
 
+
+@pytest.fixture(scope="module")
+def stub_broker():
+    broker = StubBroker()
+    broker.declare_actor(process_report_task)
+    redis_broker = process_report_task.broker
+    process_report_task.broker = broker
+
+    yield broker
+
+    process_report_task.broker = redis_broker
+
+
+def _enqueued_messages(broker) -> list[Message]:
+    queue = broker.queues[REPORTS_QUEUE]
+    return [Message.decode(queue.get_nowait()) for _ in range(queue.qsize())]
+
+
+@pytest.fixture(scope="module")
+def stub_providers(app_container):
+    app_container.report_file_reader.override(FILE_READER)
+    app_container.report_data_builder.override(BUILDER)
+    app_container.processed_report_repository.override(REPOSITORY)
+
+    yield
+
+    app_container.report_file_reader.reset_override()
+    app_container.report_data_builder.reset_override()
+    app_container.processed_report_repository.reset_override()
+
+
+@pytest_asyncio.fixture
+async def api_client(app_container, client, stub_providers, stub_broker):
+    for stub in (FILE_READER, BUILDER, REPOSITORY):
+        stub.reset()
+    stub_broker.flush_all()
+
+    api_key = app_container.config.api_keys.service()
+    yield client, REPOSITORY, BUILDER, FILE_READER, api_key
+
+
+async def test_upload_report_enqueues_processing(
+    api_client, app_container, stub_broker
+):
+    client, repository, builder, file_reader, api_key = api_client
+    response = await _post_report(client, api_key)
+
     assert response.status_code == 202
     payload = response.json()
     report_id = UUID(payload["report_id"])
 
     assert payload["structured_output"] == [{"account": "Revenue", "amount": "1000"}]
-    assert builder.calls, "Background processing did not run"
-    assert file_reader.read_calls and file_reader.structured_calls
+    assert file_reader.read_all_calls
+    assert not file_reader.read_calls and not file_reader.structured_calls
+    assert not os.path.exists(file_reader.read_all_calls[0])
+    assert not builder.calls, "Processing must not run in the API process"
+
+    (message,) = _enqueued_messages(stub_broker)
+    assert message.args == (
+        str(report_id),
+        {"content": "content", "metadata": {"source": "test"}},
+    )
+
+    await process_report(app_container, ReportFileData(**message.args[1]), report_id)
+
+    assert builder.calls
     assert report_id in repository.storage
 
 
-def test_get_processed_report_returns_data(api_client):
-    client, _, _, _, api_key = api_client
-    upload_response = client.post(
-        "/reports",
-        files={
-            "file": (
-                "report.xlsx",
-                io.BytesIO(b"binary-xlsx-data"),
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            )
-        },
-        headers={"X-API-Key": api_key},
+async def test_process_report_stores_processing_error(
+    api_client, app_container, next_uuid
+):
+    _, repository, _, _, _ = api_client
+    report_id = next_uuid()
+
+    class FailingBuilder:
+        async def process(self, report_file_data):
+            return RuntimeError("LLM timeout")
+
+    with app_container.report_data_builder.override(FailingBuilder()):
+        await process_report(
+            app_container, ReportFileData(content="content", metadata={}), report_id
+        )
+
+    assert repository.storage[report_id].error == "LLM timeout"
+    assert repository.storage[report_id].data == {}
+
+
+async def test_process_report_stores_processor_configuration_error(
+    api_client, app_container, next_uuid
+):
+    _, repository, _, _, _ = api_client
+    report_id = next_uuid()
+
+    class MisconfiguredBuilder:
+        async def process(self, report_file_data):
+            raise ValueError("Invalid prompt template")
+
+    with app_container.report_data_builder.override(MisconfiguredBuilder()):
+        await process_report(
+            app_container, ReportFileData(content="content", metadata={}), report_id
+        )
+
+    assert repository.storage[report_id].error == "Invalid prompt template"
+
+
+async def test_startup_fails_on_invalid_prompt_template():
+    container = AppContainer()
+    container.config.api_keys.openai.from_value("test-api-key")
+    container.config.llm.prompt_template.from_value("Prompt {unknown_placeholder}")
+    container.config.database.url.from_value("sqlite+aiosqlite:///:memory:")
+    app = create_app(container=container)
+
+    with pytest.raises(ValueError, match="Invalid prompt template"):
+        async with app.router.lifespan_context(app):
+            pass
+
+
+async def test_get_processed_report_returns_data(api_client, next_uuid):
+    client, repository, _, _, api_key = api_client
+    report_id = next_uuid()
+    repository.storage[report_id] = ProcessedData(
+        report_id=report_id,
+        data={"metric": MetricValues(current="10", previous="5")},
     )
-    report_id = upload_response.json()["report_id"]
 
-    response = client.get(f"/reports/{report_id}", headers={"X-API-Key": api_key})
+    response = await client.get(f"/reports/{report_id}", headers={"X-API-Key": api_key})
 
     assert response.status_code == 200
     payload = response.json()
-    assert payload["report_id"] == report_id
+    assert payload["report_id"] == str(report_id)
     assert payload["data"]["metric"]["current"] == "10"
 
 
-def test_get_processed_report_returns_error_when_processing_failed(api_client):
-    client, _, _, _, api_key = api_client
-    repository = client.app.state.container.processed_report_repository()
-    failed_report_id = uuid7()
+async def test_get_processed_report_returns_error_when_processing_failed(
+    api_client, next_uuid
+):
+    client, repository, _, _, api_key = api_client
+    failed_report_id = next_uuid()
 
     repository.storage[failed_report_id] = ProcessedData(
         report_id=failed_report_id,
@@ -124,7 +245,7 @@ def test_get_processed_report_returns_error_when_processing_failed(api_client):
         error="LLM timeout",
     )
 
-    response = client.get(
+    response = await client.get(
         f"/reports/{failed_report_id}",
         headers={"X-API-Key": api_key},
     )
@@ -135,56 +256,104 @@ def test_get_processed_report_returns_error_when_processing_failed(api_client):
     )
 
 
-def test_get_processed_report_returns_404_when_missing(api_client):
+async def test_get_processed_report_returns_404_when_missing(api_client, next_uuid):
     client, _, _, _, api_key = api_client
-    missing_id = uuid7()
+    missing_id = next_uuid()
 
-    response = client.get(f"/reports/{missing_id}", headers={"X-API-Key": api_key})
+    response = await client.get(
+        f"/reports/{missing_id}", headers={"X-API-Key": api_key}
+    )
 
     assert response.status_code == 404
 
 
-def test_upload_rejects_files_without_required_extension(api_client):
+async def test_upload_rejects_files_without_required_extension(api_client):
     client, _, _, _, api_key = api_client
 
-    response = client.post(
-        "/reports",
-        files={
-            "file": (
-                "report.txt",
-                io.BytesIO(b"text"),
-                "text/plain",
-            )
-        },
-        headers={"X-API-Key": api_key},
+    response = await _post_report(
+        client, api_key, body=b"text", name="report.txt", content_type="text/plain"
     )
 
     assert response.status_code == 422
 
 
-def test_upload_rejects_large_files(api_client):
-    client, _, _, _, api_key = api_client
+async def test_upload_rejects_unsupported_content_type(api_client):
+    client, _, _, file_reader, api_key = api_client
 
-    response = client.post(
-        "/reports",
-        files={
-            "file": (
-                "report.xlsx",
-                io.BytesIO(b"a" * (2 * 1024 * 1024 + 1)),
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            )
-        },
-        headers={"X-API-Key": api_key},
+    response = await _post_report(
+        client, api_key, body=b"text", content_type="text/plain"
     )
 
     assert response.status_code == 422
+    assert response.json()["detail"] == "Unsupported file content type"
+    assert not file_reader.read_all_calls
+
+
+async def test_upload_rejects_files_over_configured_limit(api_client, app_container):
+    client, _, _, file_reader, api_key = api_client
+
+    with app_container.config.uploads.max_size_bytes.override(16):
+        response = await _post_report(client, api_key, body=b"x" * 17)
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "File exceeded 16 byte limit"
+    assert not file_reader.read_all_calls
+
+
+async def test_persist_upload_rejects_declared_size_over_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    upload = SimpleNamespace(size=MAX_UPLOAD_SIZE_BYTES + 1)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await _persist_upload(upload)
+
+    assert exc_info.value.status_code == 422
+    assert exc_info.value.detail == "File exceeded 2MB limit"
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_persist_upload_rejects_oversized_stream_without_declared_size(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    upload = UploadFile(file=io.BytesIO(b"x" * 17))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await _persist_upload(upload, 16)
+
+    assert exc_info.value.status_code == 422
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_persist_upload_copies_spooled_file_from_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    with SpooledTemporaryFile(max_size=1) as spooled:
+        spooled.write(b"binary-xlsx-data")
+        spooled.seek(0)
+        assert spooled._rolled
+
+        temp_path = await _persist_upload(UploadFile(file=spooled))
+
+    with open(temp_path, "rb") as persisted:
+        assert persisted.read() == b"binary-xlsx-data"
+    os.remove(temp_path)
+
+
+async def test_persist_upload_rejects_oversized_spooled_file(tmp_path, monkeypatch):
+    with SpooledTemporaryFile(max_size=1) as spooled:
+        spooled.write(b"x" * 17)
+        spooled.seek(0)
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+
+        with pytest.raises(HTTPException) as exc_info:
+            await _persist_upload(UploadFile(file=spooled), 16)
 
+    assert exc_info.value.status_code == 422
+    assert list(tmp_path.iterdir()) == []
 
-def test_health_endpoint_returns_ok(app_container):
-    app = create_app(container=app_container)
 
-    with TestClient(app) as client:
-        response = client.get("/health")
+async def test_health_endpoint_returns_ok(client):
+    response = await client.get("/health")
 
     assert response.status_code == 200
     assert response.text == "OK"
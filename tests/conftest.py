@@ -1,28 +1,53 @@
-import asyncio
-import os
+from collections.abc import Callable
+from uuid import UUID, uuid7
 
 import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
 
 from app.container import AppContainer
+from app.main import create_app
 
+SERVICE_API_KEY = "test-key"
 
-@pytest.fixture(scope="session", autouse=True)
-def app_container() -> AppContainer:
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def app_container() -> AppContainer:
     container = AppContainer()
-    db_path = "./test_fin_reports.db"
     container.config.api_keys.openai.from_value("test-api-key")
     container.config.llm.prompt_template.from_value("Prompt {metadata_json}")
-    container.config.database.url.from_value(f"sqlite+aiosqlite:///{db_path}")
-
-    async def setup_resources():
-        await container.init_resources()
+    container.config.database.url.from_value("sqlite+aiosqlite:///:memory:")
 
-    asyncio.run(setup_resources())
+    await container.init_resources()
 
     yield container
 
     # Teardown
     container.unwire()
-    asyncio.run(container.shutdown_resources())
-    if os.path.exists(db_path):
-        os.remove(db_path)
+    await container.shutdown_resources()
+
+
+@pytest.fixture(scope="session")
+def uuid_pool() -> list[UUID]:
+    return [uuid7() for _ in range(64)]
+
+
+@pytest.fixture(scope="session")
+def next_uuid(uuid_pool) -> Callable[[], UUID]:
+    # One iterator for the whole run, so no two tests share an id.
+    return iter(uuid_pool).__next__
+
+
+@pytest.fixture(scope="session")
+def app(app_container) -> FastAPI:
+    app_container.config.api_keys.service.from_value(SERVICE_API_KEY)
+    return create_app(container=app_container)
+
+
+@pytest_asyncio.fixture
+async def client(app) -> AsyncClient:
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as async_client:
+        yield async_client
@@ -1,4 +1,4 @@
-from uuid import uuid7
+import asyncio
 
 import pytest
 from dependency_injector import providers
@@ -19,17 +19,17 @@ class StubReportDataProcessor(ReportDataProcessor):
         return self._process_result
 
 
-@pytest.mark.asyncio
 async def test_report_data_builder_process_delegates_to_factory(
-    app_container, anyio_backend
+    app_container, anyio_backend, next_uuid
 ):
     expected_result = ProcessedData(
-        report_id=uuid7(),
+        report_id=next_uuid(),
         data={"metric": MetricValues(current="1", previous="0")},
     )
     factory_calls = {"count": 0, "metrics": None}
+    metrics_config = app_container.report_metrics_config()
 
-    def factory(metrics_config):
+    def factory():
         factory_calls["count"] += 1
         factory_calls["metrics"] = metrics_config
         return StubReportDataProcessor(
@@ -38,17 +38,18 @@ async def test_report_data_builder_process_delegates_to_factory(
         )
 
     with app_container.override_providers(
-        report_data_processor_factory=providers.Factory(factory)
+        shared_report_data_processor=providers.Factory(factory)
     ):
         builder = app_container.report_data_builder()
         report_file_data = ReportFileData(content="body", metadata={"report_id": "42"})
 
-        result_first = await builder.process(report_file_data)
-        result_second = await builder.process(report_file_data)
+        result_first, result_second = await asyncio.gather(
+            builder.process(report_file_data), builder.process(report_file_data)
+        )
 
     assert result_first.data == expected_result.data
     assert result_second.data == expected_result.data
-    assert factory_calls["count"] == 2
+    assert factory_calls["count"] == 1
     assert set(factory_calls["metrics"].keys()) >= {
         "non_current_assets",
         "current_assets",
@@ -57,20 +58,18 @@ async def test_report_data_builder_process_delegates_to_factory(
     }
 
 
-@pytest.mark.asyncio
-async def test_report_data_builder_uses_custom_metrics_config():
+async def test_report_data_builder_uses_custom_metrics_config(next_uuid):
     custom_metrics = {"custom_metric": {"aliases": ("alias",)}}
     expected_result = ProcessedData(
-        report_id=uuid7(),
+        report_id=next_uuid(),
         data={"custom_metric": MetricValues(current="5", previous=None)},
     )
-    factory_calls = {"count": 0, "metrics": None}
+    factory_calls = {"count": 0}
 
-    def factory(metrics_config):
+    def factory():
         factory_calls["count"] += 1
-        factory_calls["metrics"] = metrics_config
         return StubReportDataProcessor(
-            metrics_config=metrics_config,
+            metrics_config=ReportDataBuilder.resolve_metrics_config(custom_metrics),
             process_result=expected_result,
         )
 
@@ -82,4 +81,31 @@ async def test_report_data_builder_uses_custom_metrics_config():
 
     assert result.data == expected_result.data
     assert factory_calls["count"] == 1
-    assert factory_calls["metrics"] == custom_metrics
+    assert builder.metrics_config == custom_metrics
+
+
+async def test_report_data_builder_rejects_processor_with_other_metrics_config():
+    def factory():
+        return StubReportDataProcessor(
+            metrics_config=ReportDataBuilder.resolve_metrics_config(None)
+        )
+
+    builder = ReportDataBuilder(
+        metrics_config={"custom_metric": {"aliases": ("alias",)}},
+        processor_factory=factory,
+    )
+
+    with pytest.raises(ValueError):
+        await builder.process(ReportFileData(content="custom", metadata={}))
+
+
+def test_report_data_builder_freezes_metrics_config():
+    builder = ReportDataBuilder(metrics_config={"metric": {"aliases": ("alias",)}})
+
+    with pytest.raises(TypeError):
+        builder.metrics_config["other"] = {}
+    with pytest.raises(TypeError):
+        builder.metrics_config["metric"]["aliases"] = ()
+
+    processor = StubReportDataProcessor(metrics_config=builder.metrics_config)
+    assert processor.metrics_config is builder.metrics_config
@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import text
+
+from infra.database import create_database_engine, init_database
+
+
+async def test_file_sqlite_engine_enables_wal(tmp_path):
+    engine = create_database_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+
+    async with engine.connect() as conn:
+        journal_mode = await conn.scalar(text("PRAGMA journal_mode"))
+
+    await engine.dispose()
+
+    assert journal_mode == "wal"
+
+
+async def test_in_memory_sqlite_engine_shares_one_database():
+    engine = create_database_engine("sqlite+aiosqlite:///:memory:")
+
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE shared (id INTEGER)"))
+    async with engine.connect() as conn:
+        result = await conn.scalar(text("SELECT count(*) FROM shared"))
+
+    await engine.dispose()
+
+    assert result == 0
+
+
+async def test_init_database_rejects_string_report_ids(tmp_path):
+    engine = create_database_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("CREATE TABLE processed_reports (id VARCHAR(36) PRIMARY KEY)")
+        )
+
+    with pytest.raises(RuntimeError, match="binary UUIDs"):
+        await anext(init_database(engine))
@@ -1,12 +1,14 @@
-from uuid import uuid7
-
 import pytest
+from pydantic import ValidationError
 
 from core.fin_report_file_loaders.models import ReportFileData
 from infra.llm_based_processor import (
+    MAX_CONTENT_CHARS,
+    MAX_METADATA_CHARS,
     ExtractedMetric,
     ExtractionResult,
     ReportDataProcessor,
+    build_structured_llm,
 )
 
 
@@ -27,26 +29,27 @@ class _StructuredLLMStub:
 class _LLMStub:
     def __init__(self, response: ExtractionResult):
         self._structured = _StructuredLLMStub(response)
+        self.schemas: list[type] = []
 
-    def with_structured_output(self, _schema):
+    def with_structured_output(self, schema):
+        self.schemas.append(schema)
         return self._structured
 
 
-@pytest.mark.asyncio
-async def test_llm_processor_generates_uuid7_and_process_data(monkeypatch):
+async def test_llm_processor_generates_uuid7_and_process_data(monkeypatch, next_uuid):
     extraction = ExtractionResult(
         report_id="ignored",
         metrics=[ExtractedMetric(name="metric", current="10", previous="9")],
     )
-    llm_stub = _LLMStub(extraction)
-    fake_uuid = uuid7()
+    structured_llm = _StructuredLLMStub(extraction)
+    fake_uuid = next_uuid()
     monkeypatch.setattr(
         "infra.llm_based_processor.uuid7",
         lambda: fake_uuid,
     )
 
     processor = ReportDataProcessor(
-        llm=llm_stub,
+        structured_llm=structured_llm,
         metrics_config={"metric": {}},
     )
     result = await processor.process(
@@ -56,3 +59,68 @@ async def test_llm_processor_generates_uuid7_and_process_data(monkeypatch):
     assert result.report_id == fake_uuid
     assert result.data["metric"].current == "10"
     assert result.data["metric"].previous == "9"
+    prompt = structured_llm.invocations[0]
+    assert '{"id":"meta"}' in prompt
+    assert '{"metric":{}}' in prompt
+
+
+def test_llm_processor_rejects_invalid_prompt_template():
+    with pytest.raises(ValueError):
+        ReportDataProcessor(
+            structured_llm=_StructuredLLMStub(ExtractionResult()),
+            metrics_config={"metric": {}},
+            prompt_template="Prompt {unknown_placeholder}",
+        )
+
+
+async def test_llm_processor_fills_missing_and_ignores_unknown_metrics():
+    extraction = ExtractionResult(
+        metrics=[
+            ExtractedMetric(name="metric", current="10", previous="9"),
+            ExtractedMetric(name="unknown", current="1", previous="0"),
+        ],
+    )
+    processor = ReportDataProcessor(
+        structured_llm=_StructuredLLMStub(extraction),
+        metrics_config={"metric": {}, "missing": {}},
+    )
+
+    result = await processor.process(ReportFileData(content="body", metadata={}))
+
+    assert set(result.data) == {"metric", "missing"}
+    assert result.data["metric"].current == "10"
+    assert result.data["missing"].current is None
+    assert result.data["missing"].previous is None
+    with pytest.raises(ValidationError):
+        result.data["missing"].current = "1"
+
+
+async def test_llm_processor_bounds_metadata_and_content_in_prompt():
+    structured_llm = _StructuredLLMStub(ExtractionResult())
+    processor = ReportDataProcessor(
+        structured_llm=structured_llm,
+        metrics_config={"metric": {}},
+        prompt_template="{metadata_json}|{content}",
+    )
+
+    await processor.process(
+        ReportFileData(
+            content="x" * (MAX_CONTENT_CHARS + 10),
+            metadata={
+                "source": "report.xlsx",
+                "n_rows": 3,
+                "html": "<td>" * MAX_METADATA_CHARS,
+            },
+        )
+    )
+
+    metadata_json, content = structured_llm.invocations[0].split("|")
+    assert metadata_json == '{"source":"report.xlsx","n_rows":3}'
+    assert len(content) == MAX_CONTENT_CHARS
+
+
+def test_build_structured_llm_binds_extraction_schema():
+    llm_stub = _LLMStub(ExtractionResult())
+
+    assert build_structured_llm(llm_stub) is llm_stub._structured
+    assert llm_stub.schemas == [ExtractionResult]
@@ -1,72 +1,92 @@
-from uuid import uuid7
-
 import pytest
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+import pytest_asyncio
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from core.fin_report_processors.db_models import Base
 from core.fin_report_processors.models import MetricValues, ProcessedData
+from infra import sqlalchemy_repository
+from infra.database import create_database_engine
 from infra.sqlalchemy_repository import SqlAlchemyProcessedReportRepository
 
 
-@pytest.mark.asyncio
-async def test_repository_persists_and_retrieves_processed_report():
-    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+@pytest_asyncio.fixture(scope="session")
+async def repo_engine():
+    engine = create_database_engine("sqlite+aiosqlite:///:memory:")
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
-    session_factory = async_sessionmaker(engine, expire_on_commit=False)
-    repository = SqlAlchemyProcessedReportRepository(session_factory)
-
-    processed = ProcessedData(
-        report_id=uuid7(),
-        data={"metric": MetricValues(current="1", previous="0")},
-    )
-
-    await repository.save(processed)
-    fetched = await repository.get(processed.report_id)
+    yield engine, async_sessionmaker(engine, expire_on_commit=False)
 
     await engine.dispose()
 
-    assert fetched.report_id == processed.report_id
-    assert fetched.data == processed.data
-    assert fetched.error is None
 
+@pytest_asyncio.fixture
+async def repository(repo_engine):
+    engine, session_factory = repo_engine
 
-@pytest.mark.asyncio
-async def test_repository_persists_error_state():
-    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    yield SqlAlchemyProcessedReportRepository(session_factory)
 
-    session_factory = async_sessionmaker(engine, expire_on_commit=False)
-    repository = SqlAlchemyProcessedReportRepository(session_factory)
-
-    processed = ProcessedData(
-        report_id=uuid7(),
-        data={},
-        error="LLM failure",
-    )
-
-    await repository.save(processed)
-    fetched = await repository.get(processed.report_id)
-
-    await engine.dispose()
-
-    assert fetched.error == "LLM failure"
-    assert fetched.data == {}
-
-
-@pytest.mark.asyncio
-async def test_repository_returns_none_when_missing():
-    engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
-    session_factory = async_sessionmaker(engine, expire_on_commit=False)
-    repository = SqlAlchemyProcessedReportRepository(session_factory)
+        for table in reversed(Base.metadata.sorted_tables):
+            await conn.execute(delete(table))
+
+
+async def _save_and_get(repository, report_id, fields):
+    if fields is not None:
+        await repository.save(ProcessedData(report_id=report_id, **fields))
+    return await repository.get(report_id)
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        pytest.param(
+            {"data": {"metric": MetricValues(current="1", previous="0")}},
+            id="processed",
+        ),
+        pytest.param({"data": {}, "error": "LLM failure"}, id="error"),
+        pytest.param(None, id="missing"),
+    ],
+)
+async def test_repository_round_trips_processed_report(repository, next_uuid, fields):
+    report_id = next_uuid()
+
+    fetched = await _save_and_get(repository, report_id, fields)
+
+    if fields is None:
+        assert fetched is None
+        return
+    assert fetched.report_id == report_id
+    assert fetched.data == fields["data"]
+    assert fetched.error == fields.get("error")
+
+
+@pytest.mark.parametrize("upsert", [True, False], ids=["upsert", "fallback"])
+async def test_repository_replaces_metrics_on_resave(
+    repository, next_uuid, monkeypatch, upsert
+):
+    if not upsert:
+        monkeypatch.delitem(sqlalchemy_repository._UPSERT_INSERTS, "sqlite")
+    report_id = next_uuid()
+    await repository.save(
+        ProcessedData(
+            report_id=report_id,
+            data={
+                "metric": MetricValues(current="1", previous="0"),
+                "stale": MetricValues(current="3", previous="2"),
+            },
+        )
+    )
+    updated = ProcessedData(
+        report_id=report_id,
+        data={"metric": MetricValues(current="5", previous="4")},
+    )
 
-    fetched = await repository.get(uuid7())
+    await repository.save(updated)
+    fetched = await repository.get(report_id)
 
-    await engine.dispose()
-
-    assert fetched is None
+    assert fetched.data == updated.data
+    assert fetched.processed_at.replace(tzinfo=None) == updated.processed_at.replace(
+        tzinfo=None
+    )
@@ -1,85 +1,129 @@
 from pathlib import Path
-from types import SimpleNamespace
 
-import pandas as pd
+import openpyxl
 import pytest
 
 from infra.xlsx_reader import XlsxFileReader
 
+TEST_XLSX = Path(__file__).resolve().parent.parent / "test_data" / "simple_example.xlsx"
 
-@pytest.mark.asyncio
-async def test_xlsx_file_reader_merges_docs(monkeypatch):
-    test_file = (
-        Path(__file__).resolve().parent.parent / "test_data" / "simple_example.xlsx"
-    )
-    captured = {}
-    docs = [
-        SimpleNamespace(page_content="First page", metadata={"source": "sheet1"}),
-        SimpleNamespace(page_content="Second page", metadata={"author": "bot"}),
-    ]
 
-    class LoaderStub:
-        def __init__(self, file_path: str, mode: str):
-            captured["file_path"] = file_path
-            captured["mode"] = mode
+def _write_workbook(path, rows, extra_sheets=None):
+    workbook = openpyxl.Workbook()
+    sheets = [(workbook.active, rows)]
+    for title, sheet_rows in (extra_sheets or {}).items():
+        sheets.append((workbook.create_sheet(title), sheet_rows))
+    for worksheet, sheet_rows in sheets:
+        for row in sheet_rows:
+            worksheet.append(row)
+    workbook.save(path)
+    return path
 
-        async def aload(self):
-            return docs
 
-    monkeypatch.setattr(
-        "infra.xlsx_reader.UnstructuredExcelLoader",
-        LoaderStub,
-    )
+@pytest.fixture(scope="module")
+def workbook_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("workbooks")
 
-    reader = XlsxFileReader()
-    result = await reader.read(str(test_file))
 
-    assert captured["file_path"] == str(test_file)
-    assert captured["mode"] == "single"
-    assert result.content == "First page\n\nSecond page"
-    assert result.metadata == {"source": "sheet1", "author": "bot"}
+@pytest.fixture(scope="module")
+def empty_workbook(workbook_dir):
+    return _write_workbook(workbook_dir / "empty.xlsx", [])
 
 
-@pytest.mark.asyncio
-async def test_xlsx_file_reader_raises_for_empty_loader(monkeypatch):
-    class EmptyLoaderStub:
-        def __init__(self, *_args, **_kwargs):
-            pass
+@pytest.fixture(scope="module")
+def records_workbook(workbook_dir):
+    return _write_workbook(
+        workbook_dir / "records.xlsx",
+        [["account", "amount"], ["Revenue", 1234.56], ["Expense", 42.0]],
+    )
 
-        async def aload(self):
-            return []
 
-    monkeypatch.setattr(
-        "infra.xlsx_reader.UnstructuredExcelLoader",
-        EmptyLoaderStub,
-    )
+async def test_xlsx_file_reader_reads_sheet_rows():
     reader = XlsxFileReader()
+    result = await reader.read(str(TEST_XLSX))
 
-    with pytest.raises(ValueError):
-        await reader.read("/tmp/does-not-matter.xlsx")
+    lines = result.content.split("\n")
+    assert lines[0] == (
+        "Example Company GmbH\tSimple Balance Sheet Data for 2023"
+        "\tTime 10:00:00\tDate 01.01.2023"
+    )
+    assert "Intangible Assets\t20000\t18000" in lines
+    assert "" not in lines
+    assert result.metadata == {
+        "source": str(TEST_XLSX),
+        "sheet_names": ["Sheet1"],
+        "n_rows": len(lines),
+        "n_cols": 4,
+    }
 
 
-@pytest.mark.asyncio
-async def test_structured_output_returns_records(monkeypatch):
+async def test_xlsx_file_reader_raises_for_empty_workbook(empty_workbook):
     reader = XlsxFileReader()
-    dataframe = pd.DataFrame(
-        [
-            {"account": "Revenue", "amount": 1234.56},
-            {"account": "Expense", "amount": 42.0},
-        ]
-    )
-    captured = {}
 
-    def fake_read_excel(path: str):
-        captured["path"] = path
-        return dataframe
+    with pytest.raises(ValueError):
+        await reader.read(str(empty_workbook))
 
-    monkeypatch.setattr("infra.xlsx_reader.pd.read_excel", fake_read_excel)
 
-    result = await reader.structured_output("/tmp/sample.xlsx")
+async def test_structured_output_returns_records(records_workbook):
+    reader = XlsxFileReader()
+    result = await reader.structured_output(str(records_workbook))
 
-    assert captured["path"] == "/tmp/sample.xlsx"
     assert result == [
         {"account": "Revenue", "amount": 1234.56},
         {"account": "Expense", "amount": 42.0},
     ]
+
+
+async def test_structured_output_returns_empty_list_for_empty_sheet(empty_workbook):
+    reader = XlsxFileReader()
+
+    assert await reader.structured_output(str(empty_workbook)) == []
+
+
+async def test_read_all_returns_records_and_content_from_one_parse(tmp_path):
+    test_file = _write_workbook(
+        tmp_path / "sample.xlsx",
+        [["account", "amount"], ["Revenue", 1234.56]],
+        extra_sheets={"Notes": [["audited"]]},
+    )
+
+    reader = XlsxFileReader()
+    records, report_file_data = await reader.read_all(str(test_file))
+
+    assert records == [{"account": "Revenue", "amount": 1234.56}]
+    assert report_file_data.content == "account\tamount\nRevenue\t1234.56\n\naudited"
+    assert report_file_data.metadata == {
+        "source": str(test_file),
+        "sheet_names": ["Sheet", "Notes"],
+        "n_rows": 3,
+        "n_cols": 2,
+    }
+
+
+async def test_structured_output_names_blank_and_numeric_headers(tmp_path):
+    test_file = _write_workbook(
+        tmp_path / "headers.xlsx", [["account", None, 2023], ["Revenue", "note", 10]]
+    )
+
+    reader = XlsxFileReader()
+    result = await reader.structured_output(str(test_file))
+    records, _ = await reader.read_all(str(test_file))
+
+    expected = [{"account": "Revenue", "Unnamed: 1": "note", "2023": 10}]
+    assert result == expected
+    assert records == expected
+
+
+async def test_structured_output_suffixes_duplicate_headers(tmp_path):
+    test_file = _write_workbook(
+        tmp_path / "duplicates.xlsx",
+        [["amount", "amount", "amount.1", "amount"], [1, 2, 3, 4]],
+    )
+
+    reader = XlsxFileReader()
+    result = await reader.structured_output(str(test_file))
+    records, _ = await reader.read_all(str(test_file))
+
+    expected = [{"amount": 1, "amount.2": 2, "amount.1": 3, "amount.3": 4}]
+    assert result == expected
+    assert records == expected